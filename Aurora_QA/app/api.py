@@ -1,11 +1,38 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Query
 from collections import Counter
-from app.data_client import fetch_member_messages, fetch_raw_messages
-from app.qa_engine import answer_question_baseline
+from app.data_client import (
+    close_client,
+    fetch_raw_messages,
+    get_cached_member_index,
+    open_client,
+)
+from app.batcher import QuestionBatcher
+
+batcher = QuestionBatcher()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_client()
+    await batcher.start()
+    # Warm the cache (from disk if another worker already fetched it).
+    # This is only an optimization: on any failure the first /ask retries.
+    try:
+        await get_cached_member_index()
+    except Exception:
+        logger.exception("Cache warm-up failed; will retry on the first /ask")
+
+    yield
+
+    await batcher.stop()
+    await close_client()
 
 app = FastAPI(
     title="Aurora QA Service",
     description="Simple question-answering service over Aurora member messages.",
+    lifespan=lifespan,
 )
 
 @app.get("/health")
@@ -13,35 +40,34 @@ def health():
     return {"status": "ok"}
 
 @app.get("/ask")
-def ask(question: str = Query(..., description="Natural-language question about a member")):
+async def ask(question: str = Query(..., description="Natural-language question about a member")):
     """
     Main endpoint: given a question, returns an answer inferred from /messages.
     """
-    messages = fetch_member_messages()
-    answer = answer_question_baseline(question, messages)
+    answer = await batcher.submit(question)
     return {"answer": answer}
 
 @app.get("/debug/messages_sample")
-def messages_sample():
+async def messages_sample():
     """
     Debug endpoint: returns a small sample of the raw /messages data
     so we can inspect the actual JSON structure.
     """
-    raw = fetch_raw_messages()
+    raw = await fetch_raw_messages()
     # Return only first few items to avoid huge responses
     if isinstance(raw, list):
         return raw[:5]
     return raw
 
 @app.get("/debug/member_names")
-def member_names():
+async def member_names():
     """
     Debug endpoint: show all distinct member names and how many messages each has.
     """
-    messages = fetch_member_messages()
+    index = await get_cached_member_index()
     counts = Counter()
 
-    for m in messages:
+    for m in index.messages:
         name = (m.member_name or "").strip()
         counts[name] += 1
 
@@ -0,0 +1,95 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from app.data_client import get_cached_member_index
+from app.index import MemberIndex
+from app.qa_engine import answer_question_baseline
+
+# Answer at most this many queued questions per batch
+MAX_BATCH_SIZE = 32
+
+
+class QuestionBatcher:
+    """
+    Micro-batches concurrent /ask questions.
+
+    Questions that queue up while a batch is being answered are answered
+    together against a single lookup of the cached member index, instead of
+    each request fetching the index on its own. A lone question is answered
+    immediately; nothing waits for a batch to fill. The CPU-bound answering
+    runs in a worker thread so the event loop keeps serving other connections.
+    """
+
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE):
+        self.max_batch_size = max_batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background task that drains the queue."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, question: str) -> str:
+        """Queue a question and wait for its answer."""
+        if self._queue is None:
+            raise RuntimeError("QuestionBatcher has not been started")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((question, future))
+        return await future
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        # Block for the first question, then take whatever is already waiting
+        batch = [await self._queue.get()]
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    @staticmethod
+    def _answer_batch(
+        questions: List[str],
+        index: MemberIndex,
+    ) -> List[Tuple[Optional[str], Optional[Exception]]]:
+        # Runs in a worker thread: pure CPU work against the shared index
+        results: List[Tuple[Optional[str], Optional[Exception]]] = []
+        for question in questions:
+            try:
+                results.append((answer_question_baseline(question, index), None))
+            except Exception as exc:
+                results.append((None, exc))
+        return results
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            try:
+                index = await get_cached_member_index()
+                # Keep the event loop free to accept requests while QA runs
+                results = await asyncio.to_thread(
+                    self._answer_batch, [question for question, _future in batch], index
+                )
+            except Exception as exc:
+                for _question, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (_question, future), (answer, error) in zip(batch, results):
+                if future.done():
+                    # Caller went away (e.g. client disconnected)
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(answer)
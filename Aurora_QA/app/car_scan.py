@@ -0,0 +1,187 @@
+"""
+Numba-compiled scanner for "<number> car(s)" mentions.
+
+Works on the UTF-8 bytes of lowercased message texts, concatenated into one
+buffer with per-message start/end offsets (see MemberIndex). It mirrors the
+regex r"\b(\d+)\s+car" without using regex inside the JIT'd code. Differences
+from the regex: word boundaries and digits are ASCII-only, and whitespace is
+ASCII plus U+00A0 (no-break space) and U+0085; other Unicode spaces such as
+U+2009 or U+3000 don't separate the number from "car".
+
+Digit runs are detected and parsed eight bytes at a time with SWAR
+(SIMD-within-a-register) arithmetic on a uint64, falling back to a byte
+loop only for the last <8 bytes of a message. Runs longer than 18 digits
+would overflow int64, so their value is parsed with Python's int() instead.
+"""
+import numpy as np
+from numba import njit
+
+# Longest digit run whose value always fits in an int64
+_MAX_INT64_DIGITS = 18
+
+_ONES = np.uint64(0x0101010101010101)
+_HIGH_BITS = np.uint64(0x8080808080808080)
+_LOW_7_BITS = np.uint64(0x7F7F7F7F7F7F7F7F)
+# Adding these to a byte < 0x80 sets its high bit iff byte >= '0' / byte > '9'
+_ADD_GE_ZERO = np.uint64(0x5050505050505050)  # 0x80 - 0x30
+_ADD_GT_NINE = np.uint64(0x4646464646464646)  # 0x80 - 0x3A
+_ASCII_ZEROS = np.uint64(0x3030303030303030)
+_POW10 = np.array([10 ** k for k in range(9)], dtype=np.int64)
+
+
+@njit(cache=True)
+def _is_word_byte(b):
+    return (
+        (b >= 48 and b <= 57)  # 0-9
+        or (b >= 97 and b <= 122)  # a-z
+        or (b >= 65 and b <= 90)  # A-Z
+        or b == 95  # _
+    )
+
+
+@njit(cache=True)
+def _space_length(buf, k, end):
+    """Byte length of the whitespace character at buf[k], or 0 if it isn't one."""
+    b = buf[k]
+    # space, \t \n \v \f \r, and the \x1c-\x1f separators Python's \s accepts
+    if b == 32 or (b >= 9 and b <= 13) or (b >= 28 and b <= 31):
+        return 1
+    # UTF-8 for U+00A0 (no-break space) and U+0085 (next line)
+    if b == 0xC2 and k + 1 < end and (buf[k + 1] == 0xA0 or buf[k + 1] == 0x85):
+        return 2
+    return 0
+
+
+@njit(cache=True)
+def _load_word(buf, i):
+    # Little-endian: buf[i] ends up in the lowest byte
+    word = np.uint64(0)
+    for k in range(8):
+        word |= np.uint64(buf[i + k]) << np.uint64(8 * k)
+    return word
+
+
+@njit(cache=True)
+def _leading_digit_count(word):
+    """Number of leading (lowest-addressed) bytes of `word` that are ASCII digits."""
+    low = word & _LOW_7_BITS
+    is_digit = (
+        ((low + _ADD_GE_ZERO) & _HIGH_BITS)
+        & ~((low + _ADD_GT_NINE) & _HIGH_BITS)
+        & ~(word & _HIGH_BITS)
+    )
+    non_digit = ~is_digit & _HIGH_BITS
+    # Isolate the first non-digit's high bit (0 if all eight are digits),
+    # turn every byte below it into 0x01 and sum them with one multiply
+    first = non_digit & (~non_digit + np.uint64(1))
+    below = ((first >> np.uint64(7)) - np.uint64(1)) & _ONES
+    return np.int64((below * _ONES) >> np.uint64(56))
+
+
+@njit(cache=True)
+def _parse_leading_digits(word, n):
+    """Value of the first `n` (1-8) digit bytes of `word`."""
+    # Shift the digits to the top and pad the freed low bytes with '0'
+    pad = np.uint64(8 * (8 - n))
+    word = (word << pad) | (_ASCII_ZEROS & ((np.uint64(1) << pad) - np.uint64(1)))
+    word = ((word & np.uint64(0x0F0F0F0F0F0F0F0F)) * np.uint64(2561)) >> np.uint64(8)
+    word = ((word & np.uint64(0x00FF00FF00FF00FF)) * np.uint64(6553601)) >> np.uint64(16)
+    word = ((word & np.uint64(0x0000FFFF0000FFFF)) * np.uint64(42949672960001)) >> np.uint64(32)
+    return np.int64(word)
+
+
+@njit(cache=True)
+def _scan_digit_run(buf, start, end):
+    """
+    Return (end of the digit run starting at `start`, its value). The value
+    is only meaningful for runs of at most _MAX_INT64_DIGITS digits; past
+    that it stops accumulating rather than overflow.
+    """
+    value = np.int64(0)
+    j = start
+    while j + 8 <= end:
+        word = _load_word(buf, j)
+        n = _leading_digit_count(word)
+        if n == 0:
+            return j, value
+        if j - start + n <= _MAX_INT64_DIGITS:
+            value = value * _POW10[n] + _parse_leading_digits(word, n)
+        j += n
+        if n < 8:
+            return j, value
+
+    # Tail shorter than a word
+    while j < end and buf[j] >= 48 and buf[j] <= 57:
+        if j - start < _MAX_INT64_DIGITS:
+            value = value * 10 + np.int64(buf[j] - 48)
+        j += 1
+    return j, value
+
+
+@njit(cache=True)
+def _car_count_in_message(buf, start, end):
+    """Return (digit start, digit end, value) of the first match, or (-1, -1, 0)."""
+    i = start
+    while i < end:
+        b = buf[i]
+        if b < 48 or b > 57 or (i > start and _is_word_byte(buf[i - 1])):
+            i += 1
+            continue
+
+        # Digit run starting on a word boundary
+        j, value = _scan_digit_run(buf, i, end)
+
+        k = j
+        while k < end:
+            width = _space_length(buf, k, end)
+            if width == 0:
+                break
+            k += width
+
+        if (
+            k > j
+            and k + 3 <= end
+            and buf[k] == 99  # c
+            and buf[k + 1] == 97  # a
+            and buf[k + 2] == 114  # r
+        ):
+            return i, j, value
+
+        # No later position inside this digit run can start a match
+        i = j
+    return -1, -1, np.int64(0)
+
+
+@njit(cache=True)
+def _find_last_car_count(buf, starts, ends):
+    for m in range(len(starts) - 1, -1, -1):
+        digit_start, digit_end, value = _car_count_in_message(buf, starts[m], ends[m])
+        if digit_start >= 0:
+            return digit_start, digit_end, value
+    return -1, -1, np.int64(0)
+
+
+def find_last_car_count(buf, starts, ends):
+    """
+    Return the car count from the newest message mentioning one, scanning
+    messages from last to first, or None if none do.
+    """
+    digit_start, digit_end, value = _find_last_car_count(buf, starts, ends)
+    if digit_start < 0:
+        return None
+    if digit_end - digit_start > _MAX_INT64_DIGITS:
+        return int(buf[digit_start:digit_end].tobytes())
+    return int(value)
+
+
+def encode_texts(texts):
+    """
+    Concatenate the UTF-8 encodings of `texts` into one uint8 buffer and
+    return (buffer, starts, ends) with each text's byte offsets.
+    """
+    encoded = [t.encode("utf-8") for t in texts]
+    lengths = np.array([len(e) for e in encoded], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return buf, starts, ends
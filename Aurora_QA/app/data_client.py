@@ -1,6 +1,13 @@
+import asyncio
 import os
-import requests
-from typing import List
+import secrets
+import stat
+import time
+from datetime import datetime
+import httpx
+import orjson
+from typing import List, Optional, Tuple
+from app.index import MemberIndex, build_member_index
 from app.models import MemberMessage
 
 # Default URL – from assignment
@@ -9,37 +16,227 @@ AURORA_MESSAGES_URL = os.getenv(
     "https://november7-730026606190.europe-west1.run.app/messages",
 )
 
-def fetch_raw_messages():
+# How long (in seconds) a fetched message list is reused before hitting Aurora again
+CACHE_TTL_SECONDS = float(os.getenv("AURORA_CACHE_TTL", "60"))
+
+# Private (0700) directory where workers share the last fetched messages;
+# set to "" to disable the disk cache
+CACHE_DIR = os.getenv(
+    "AURORA_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "aurora_qa"),
+)
+_CACHE_FILE = "messages.json"
+# Bump when the on-disk layout changes; files with another version are ignored
+_CACHE_FORMAT_VERSION = 1
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so no disk cache
+    fcntl = None
+
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+_CACHE = {"data": None, "ts": 0.0}
+_CACHE_LOCK = asyncio.Lock()
+
+# Shared HTTP client, opened/closed by the app's startup/shutdown handlers
+_CLIENT: Optional[httpx.AsyncClient] = None
+# Keep pooled connections to Aurora alive so refreshes skip the TCP+TLS handshake
+_POOL_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=CACHE_TTL_SECONDS + 30,
+)
+
+
+async def open_client() -> None:
+    """Create the shared, connection-pooled HTTP client."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(timeout=10, limits=_POOL_LIMITS)
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+async def fetch_raw_messages():
     """
     Call Aurora's /messages endpoint and return the raw JSON.
     """
-    resp = requests.get(AURORA_MESSAGES_URL, timeout=10)
+    if _CLIENT is None:
+        # Not running inside the app (e.g. a script) – use a one-off client
+        async with httpx.AsyncClient(timeout=10) as client:
+            resp = await client.get(AURORA_MESSAGES_URL)
+    else:
+        resp = await _CLIENT.get(AURORA_MESSAGES_URL)
     resp.raise_for_status()
-    return resp.json()
+    # orjson decodes the large /messages payload much faster than stdlib json
+    return orjson.loads(resp.content)
 
 
-def fetch_member_messages() -> List[MemberMessage]:
-    """
-    Fetch messages from Aurora's /messages API and convert them
-    into our internal MemberMessage objects.
-    """
-    raw = fetch_raw_messages()
+def _parse_timestamp(value) -> Optional[datetime]:
+    """Parse Aurora's ISO-8601 timestamp, returning None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
 
-    # According to the API, raw looks like:
-    # {
-    #   "total": 3349,
-    #   "items": [ { ...message... }, ... ]
-    # }
-    items = raw.get("items", [])
 
+def _messages_from_items(items) -> List[MemberMessage]:
+    """Convert raw Aurora message items into MemberMessage objects."""
     messages: List[MemberMessage] = []
     for item in items:
         msg = MemberMessage(
             member_id=item.get("user_id"),
             member_name=item.get("user_name"),
-            text=item.get("message", ""),
-            created_at=item.get("timestamp"),
+            text=item.get("message") or "",
+            created_at=_parse_timestamp(item.get("timestamp")),
         )
         messages.append(msg)
 
-    return messages
\ No newline at end of file
+    return messages
+
+
+async def fetch_message_items() -> list:
+    """Fetch the raw message items from Aurora's /messages API."""
+    raw = await fetch_raw_messages()
+
+    # According to the API, raw looks like:
+    # {
+    #   "total": 3349,
+    #   "items": [ { ...message... }, ... ]
+    # }
+    items = raw.get("items", []) if isinstance(raw, dict) else None
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("Unexpected /messages payload: expected {'items': [ {...}, ... ]}")
+    return items
+
+
+def _cache_dir_is_private() -> bool:
+    """
+    Create CACHE_DIR if needed and check that it is a real directory owned
+    by us and closed to other users; otherwise the disk cache is skipped.
+    """
+    if not CACHE_DIR or fcntl is None:
+        return False
+    try:
+        os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+        st = os.lstat(CACHE_DIR)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and not st.st_mode & 0o077
+    )
+
+
+def _load_disk_cache() -> Optional[Tuple[list, float]]:
+    """
+    Load the message items another worker saved within CACHE_TTL_SECONDS.
+    Returns (items, fetch time), or None on a miss, a different format
+    version or an unreadable file.
+    """
+    try:
+        fd = os.open(os.path.join(CACHE_DIR, _CACHE_FILE), os.O_RDONLY | _O_NOFOLLOW)
+        with os.fdopen(fd, "rb") as f:
+            payload = orjson.loads(f.read())
+        if payload.get("version") != _CACHE_FORMAT_VERSION:
+            return None
+        fetched_at = float(payload["fetched_at"])
+        items = payload["items"]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+    if not isinstance(items, list) or time.time() - fetched_at > CACHE_TTL_SECONDS:
+        return None
+    return items, fetched_at
+
+
+def _store_disk_cache(items: list, fetched_at: float) -> None:
+    """Atomically replace the saved message items."""
+    payload = orjson.dumps(
+        {"version": _CACHE_FORMAT_VERSION, "fetched_at": fetched_at, "items": items}
+    )
+    tmp_path = os.path.join(CACHE_DIR, f".{_CACHE_FILE}.{secrets.token_hex(8)}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_NOFOLLOW, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, os.path.join(CACHE_DIR, _CACHE_FILE))
+    except OSError:
+        # The disk cache is only an optimization; serve from memory regardless
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _acquire_refresh_lock() -> int:
+    """Block until this process holds the cross-worker refresh lock."""
+    fd = os.open(
+        os.path.join(CACHE_DIR, f"{_CACHE_FILE}.lock"),
+        os.O_RDWR | os.O_CREAT | _O_NOFOLLOW,
+        0o600,
+    )
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+
+def _release_refresh_lock(fd: int) -> None:
+    fcntl.flock(fd, fcntl.LOCK_UN)
+    os.close(fd)
+
+
+async def _load_or_fetch_items() -> Tuple[list, float]:
+    """
+    Return fresh message items, reusing another worker's disk cache when
+    possible. Only the worker holding the refresh lock fetches from Aurora.
+    """
+    if not await asyncio.to_thread(_cache_dir_is_private):
+        return await fetch_message_items(), time.time()
+
+    cached = await asyncio.to_thread(_load_disk_cache)
+    if cached is not None:
+        return cached
+
+    fd = await asyncio.to_thread(_acquire_refresh_lock)
+    try:
+        # Another worker may have refreshed it while we waited for the lock
+        cached = await asyncio.to_thread(_load_disk_cache)
+        if cached is not None:
+            return cached
+
+        items, fetched_at = await fetch_message_items(), time.time()
+        await asyncio.to_thread(_store_disk_cache, items, fetched_at)
+        return items, fetched_at
+    finally:
+        _release_refresh_lock(fd)
+
+
+def _build_index(items: list) -> MemberIndex:
+    return build_member_index(_messages_from_items(items))
+
+
+async def get_cached_member_index() -> MemberIndex:
+    """
+    Return the indexed member messages, re-fetching from Aurora (and
+    rebuilding the index) only when the cached copy is older than
+    CACHE_TTL_SECONDS. Messages saved under CACHE_DIR by any worker are
+    reused instead of fetching again; the index itself is always rebuilt
+    in-process.
+    """
+    async with _CACHE_LOCK:
+        if _CACHE["data"] is None or time.time() - _CACHE["ts"] > CACHE_TTL_SECONDS:
+            items, fetched_at = await _load_or_fetch_items()
+            # Parsing and indexing is the heavy CPU work; keep it off the event loop
+            _CACHE["data"] = await asyncio.to_thread(_build_index, items)
+            _CACHE["ts"] = fetched_at
+        return _CACHE["data"]
@@ -0,0 +1,106 @@
+"""
+Message scans shared by the index build and the QA handlers, and the
+per-member facts precomputed from them.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from app.car_scan import find_last_car_count
+from app.models import MemberMessage
+
+
+@dataclass(slots=True)
+class MemberFacts:
+    """
+    Answers for one member that don't depend on the question wording,
+    precomputed at index time so /ask only formats them.
+    """
+    # Count from the newest message mentioning "<n> car(s)", if any
+    car_count: Optional[int]
+    # Texts of messages mentioning both "favorite" and "restaurant", in API order
+    favorite_restaurants: List[str]
+    # Newest message mentioning "trip", and the date phrase found in it
+    latest_trip_text: Optional[str]
+    latest_trip_date: Optional[str]
+
+
+# ---------- Message scans ----------
+
+def filter_messages_containing(
+    messages: List[MemberMessage],
+    texts_lower: pa.Array,
+    *needles: str,
+) -> List[MemberMessage]:
+    """
+    Return the messages whose lowercased text contains every needle.
+    `texts_lower` is the Arrow array of the same messages' text_lower,
+    so the substring scan runs in Arrow's C++ kernels.
+    """
+    mask = pc.match_substring(texts_lower, needles[0])
+    for needle in needles[1:]:
+        mask = pc.and_(mask, pc.match_substring(texts_lower, needle))
+    return [messages[i] for i in pc.indices_nonzero(mask).to_pylist()]
+
+
+# ---- Date phrases ----
+
+MONTH_PATTERN = r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?(?:,\s*\d{4})?"
+DATE_SLASH_PATTERN = r"\b\d{1,2}/\d{1,2}/\d{2,4}\b"
+
+_MONTH_RE = re.compile(MONTH_PATTERN)
+_SLASH_RE = re.compile(DATE_SLASH_PATTERN)
+
+
+def extract_date_phrase(text: str) -> Optional[str]:
+    """
+    Try to find a date-like phrase in the message: 'June 5th, 2025' or '06/05/2025'.
+    """
+    m = _MONTH_RE.search(text)
+    if m:
+        return m.group(0)
+
+    m = _SLASH_RE.search(text)
+    if m:
+        return m.group(0)
+
+    return None
+
+
+# ---------- Precomputed member facts ----------
+
+def build_member_facts(
+    messages_by_name: Dict[str, List[MemberMessage]],
+    member_texts_lower: Dict[str, pa.Array],
+    text_buffer: np.ndarray,
+    member_offsets: Dict[str, Tuple[np.ndarray, np.ndarray]],
+) -> Dict[str, MemberFacts]:
+    """
+    Run the question-independent scans (car count, favorite restaurants,
+    latest trip) once per member, so /ask only has to look the results up.
+    Called by build_member_index whenever the cache is refreshed.
+    """
+    facts: Dict[str, MemberFacts] = {}
+    for name, msgs in messages_by_name.items():
+        texts_lower = member_texts_lower[name]
+
+        starts, ends = member_offsets[name]
+        car_count = find_last_car_count(text_buffer, starts, ends)
+
+        trip_msgs = filter_messages_containing(msgs, texts_lower, "trip")
+        latest_trip = trip_msgs[-1] if trip_msgs else None
+
+        facts[name] = MemberFacts(
+            car_count=car_count,
+            favorite_restaurants=[
+                m.text
+                for m in filter_messages_containing(msgs, texts_lower, "favorite", "restaurant")
+            ],
+            latest_trip_text=latest_trip.text if latest_trip else None,
+            latest_trip_date=extract_date_phrase(latest_trip.text) if latest_trip else None,
+        )
+    return facts
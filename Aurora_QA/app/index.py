@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import ahocorasick
+import numpy as np
+import pyarrow as pa
+
+from app.car_scan import encode_texts
+from app.facts import MemberFacts, build_member_facts
+from app.models import MemberMessage
+
+
+@dataclass(slots=True)
+class MemberIndex:
+    """
+    Per-member lookup tables derived from the full message list.
+
+    Built once whenever the message cache is refreshed, so /ask only does
+    dictionary lookups instead of rescanning every message.
+    """
+    messages: List[MemberMessage]
+    # Member name -> that member's messages, in API order
+    messages_by_name: Dict[str, List[MemberMessage]]
+    # Lowercased first name -> full names sharing it
+    by_first: Dict[str, List[str]]
+    # Member name -> that member's lowercased texts, for vectorized substring scans
+    member_texts_lower: Dict[str, pa.Array]
+    # UTF-8 bytes of every member's text_lower, grouped by member (for car_scan)
+    text_buffer: np.ndarray
+    # Member name -> (starts, ends) byte offsets of their messages in text_buffer
+    member_offsets: Dict[str, Tuple[np.ndarray, np.ndarray]]
+    # Lowercased first name of each member, parallel to first_name_owners
+    first_names: List[str]
+    first_name_owners: List[str]
+    # Member name -> number of messages
+    msg_counts: Dict[str, int]
+    # Aho-Corasick automaton over lowercased full names (value: original name)
+    name_automaton: ahocorasick.Automaton
+    # Member name -> precomputed answers (see MemberFacts)
+    member_facts: Dict[str, MemberFacts]
+
+
+def build_member_index(messages: List[MemberMessage]) -> MemberIndex:
+    """
+    Group the messages by member, precompute the name lookup tables and
+    each member's question-independent answers.
+    """
+    messages_by_name: Dict[str, List[MemberMessage]] = {}
+    for m in messages:
+        if m.member_name:
+            messages_by_name.setdefault(m.member_name, []).append(m)
+
+    msg_counts = {name: len(msgs) for name, msgs in messages_by_name.items()}
+    member_texts_lower = {
+        name: pa.array([m.text_lower for m in msgs], type=pa.string())
+        for name, msgs in messages_by_name.items()
+    }
+
+    grouped_texts: List[str] = []
+    member_ranges: Dict[str, Tuple[int, int]] = {}
+    for name, msgs in messages_by_name.items():
+        first = len(grouped_texts)
+        grouped_texts.extend(m.text_lower for m in msgs)
+        member_ranges[name] = (first, len(grouped_texts))
+    text_buffer, starts, ends = encode_texts(grouped_texts)
+    member_offsets = {
+        name: (starts[first:last], ends[first:last])
+        for name, (first, last) in member_ranges.items()
+    }
+
+    by_first: Dict[str, List[str]] = {}
+    first_names: List[str] = []
+    first_name_owners: List[str] = []
+    for name in messages_by_name:
+        parts = name.split()
+        if not parts:
+            continue
+        first = parts[0].lower()
+        by_first.setdefault(first, []).append(name)
+        first_names.append(first)
+        first_name_owners.append(name)
+
+    # Case-fold every name once here instead of on each request; on
+    # lowercase collisions the first name in this order keeps the key
+    lower_names_desc_len = sorted(
+        ((name.lower(), name) for name in messages_by_name),
+        key=lambda pair: -len(pair[0]),
+    )
+    lower_to_original: Dict[str, str] = {}
+    for lower_name, name in lower_names_desc_len:
+        lower_to_original.setdefault(lower_name, name)
+
+    name_automaton = ahocorasick.Automaton()
+    for lower_name, name in lower_to_original.items():
+        name_automaton.add_word(lower_name, name)
+    if len(name_automaton):
+        name_automaton.make_automaton()
+
+    return MemberIndex(
+        messages=messages,
+        messages_by_name=messages_by_name,
+        member_texts_lower=member_texts_lower,
+        text_buffer=text_buffer,
+        member_offsets=member_offsets,
+        by_first=by_first,
+        first_names=first_names,
+        first_name_owners=first_name_owners,
+        msg_counts=msg_counts,
+        name_automaton=name_automaton,
+        member_facts=build_member_facts(
+            messages_by_name, member_texts_lower, text_buffer, member_offsets
+        ),
+    )
@@ -1,14 +1,21 @@
-from pydantic import BaseModel
+from dataclasses import dataclass, field
 from typing import Optional
 from datetime import datetime
 
-class MemberMessage(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class MemberMessage:
     """
     Internal representation of a member message.
 
-    NOTE: We will adjust the fields once we see the real /messages response.
+    A plain slotted dataclass: these objects never leave the service,
+    so they skip Pydantic validation and the per-instance __dict__.
     """
     member_id: Optional[str] = None
     member_name: Optional[str] = None
     text: str
     created_at: Optional[datetime] = None
+    # Lowercased copy of text, computed once so QA scans don't re-lower it
+    text_lower: str = field(init=False)
+
+    def __post_init__(self):
+        self.text_lower = self.text.lower()
@@ -1,12 +1,25 @@
 from typing import List, Optional
 import re
 
+import pyarrow as pa
+from rapidfuzz import fuzz, process
+
+from app.facts import MemberFacts, extract_date_phrase, filter_messages_containing
+from app.index import MemberIndex
 from app.models import MemberMessage
 
 
+# ---------- Precompiled patterns ----------
+
+_TOKEN_RE = re.compile(r"[a-zA-Z]+")
+_POSSESSIVE_RE = re.compile(r"\b([A-Za-z]+)'s\b")
+_NON_WORD_RE = re.compile(r"[^\w]")
+_TRIP_TO_RE = re.compile(r"trip to ([A-Za-z ]+)\??", re.IGNORECASE)
+
+
 # ---------- Helper: find member in question ----------
 
-def find_member_name_in_question(question: str, messages: List[MemberMessage]) -> Optional[str]:
+def find_member_name_in_question(question: str, index: MemberIndex) -> Optional[str]:
     """
     Try to detect which member the question is about.
 
@@ -16,38 +29,27 @@ def find_member_name_in_question(question: str, messages: List[MemberMessage]) -
     3) Non-unique first-name match: pick the member with that first name
        who appears most often in the messages.
     """
-    if not messages:
+    if not index.messages:
         return None
 
     q_lower = question.lower()
-    # All distinct member names
-    unique_names = {m.member_name for m in messages if m.member_name}
-
-    # --- Precompute per-member message counts ---
-    msg_counts: dict[str, int] = {}
-    for m in messages:
-        if m.member_name:
-            msg_counts[m.member_name] = msg_counts.get(m.member_name, 0) + 1
 
     # Normalize question into tokens (words)
-    tokens = re.findall(r"[a-zA-Z]+", q_lower)  # "Amira's" -> ["amira", "s"]
+    tokens = _TOKEN_RE.findall(q_lower)  # "Amira's" -> ["amira", "s"]
 
     # ---------- 1) Full-name substring match ----------
-    # Highest precision: if the full name literally appears in the question
-    for name in sorted(unique_names, key=len, reverse=True):
-        if not name:
-            continue
-        if name.lower() in q_lower:
-            return name
+    # Highest precision: if the full name literally appears in the question.
+    # One Aho-Corasick pass finds every name; keep the longest hit.
+    if len(index.name_automaton):
+        best_match = None
+        for _end, name in index.name_automaton.iter(q_lower):
+            if best_match is None or len(name) > len(best_match):
+                best_match = name
+        if best_match:
+            return best_match
 
     # ---------- 2) First-name map ----------
-    by_first: dict[str, List[str]] = {}
-    for name in unique_names:
-        parts = name.split()
-        if not parts:
-            continue
-        first = parts[0].lower()
-        by_first.setdefault(first, []).append(name)
+    by_first = index.by_first
 
     # 2a) Unique first-name: safe to pick directly (this is how Layla works)
     for token in tokens:
@@ -63,7 +65,7 @@ def find_member_name_in_question(question: str, messages: List[MemberMessage]) -
         if token in by_first and len(by_first[token]) > 1:
             candidates = by_first[token]
             for name in candidates:
-                score = msg_counts.get(name, 0)
+                score = index.msg_counts.get(name, 0)
                 if score > best_score:
                     best_score = score
                     best_name = name
@@ -82,7 +84,7 @@ def extract_requested_first_name(question: str) -> Optional[str]:
     "What are Amira's favorite restaurants?"
     """
     # Pattern like "Amira's"
-    m = re.search(r"\b([A-Za-z]+)'s\b", question)
+    m = _POSSESSIVE_RE.search(question)
     if m:
         return m.group(1)
 
@@ -94,7 +96,7 @@ def extract_requested_first_name(question: str) -> Optional[str]:
             continue  # skip first word "What/When/How"
         if tok and tok[0].isupper():
             # Strip trailing punctuation like "Amira?"
-            cleaned = re.sub(r"[^\w]", "", tok)
+            cleaned = _NON_WORD_RE.sub("", tok)
             if cleaned:
                 return cleaned
 
@@ -103,7 +105,7 @@ def extract_requested_first_name(question: str) -> Optional[str]:
 
 def suggest_similar_member_by_first_name(
     requested_first_name: str,
-    messages: List[MemberMessage],
+    index: MemberIndex,
     min_similarity: float = 0.80,
 ) -> Optional[str]:
     """
@@ -111,34 +113,26 @@ def suggest_similar_member_by_first_name(
     suggest the closest member's full name by first name
     (e.g., 'Amina Van Den Berg') if similarity is high enough.
     """
-    from difflib import SequenceMatcher
-
     requested = requested_first_name.lower()
-    unique_names = {m.member_name for m in messages if m.member_name}
-
-    best_full_name = None
-    best_ratio = 0.0
 
-    for full_name in unique_names:
-        parts = full_name.split()
-        if not parts:
-            continue
-        first = parts[0].lower()
-        ratio = SequenceMatcher(None, requested, first).ratio()
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_full_name = full_name
-
-    if best_full_name and best_ratio >= min_similarity:
-        return best_full_name
+    # fuzz.ratio scores 0-100, so scale the 0-1 threshold to match
+    match = process.extractOne(
+        requested,
+        index.first_names,
+        scorer=fuzz.ratio,
+        score_cutoff=min_similarity * 100,
+    )
+    if match:
+        _first, _score, position = match
+        return index.first_name_owners[position]
 
     return None
 
 
 
-def filter_messages_for_member(messages: List[MemberMessage], member_name: str) -> List[MemberMessage]:
+def filter_messages_for_member(index: MemberIndex, member_name: str) -> List[MemberMessage]:
     """Return all messages for a given member name."""
-    return [m for m in messages if m.member_name == member_name]
+    return index.messages_by_name.get(member_name, [])
 
 
 # ---------- Helper: classify question type ----------
@@ -166,65 +160,39 @@ def detect_question_type(question: str) -> str:
 
 # ---- Car count ----
 
-def extract_car_count_from_text(text: str) -> Optional[int]:
-    """
-    Look for patterns like '2 cars', '1 car' in the message text.
-    """
-    m = re.search(r"\b(\d+)\s+car", text.lower())
-    if m:
-        try:
-            return int(m.group(1))
-        except ValueError:
-            return None
-    return None
-
-
-def answer_car_count(member_name: str, messages: List[MemberMessage]) -> str:
+def answer_car_count(member_name: str, facts: MemberFacts) -> str:
     """
     Try to answer 'How many cars does X have?' for a member.
-    We scan their messages from latest to oldest and look for a number before 'car(s)'.
+    The count comes from the member's latest message with a number before 'car(s)',
+    found at index time (see build_member_facts).
     """
-    for msg in reversed(messages):  # newest first
-        count = extract_car_count_from_text(msg.text)
-        if count is not None:
-            return f"{member_name} has {count} car{'s' if count != 1 else ''}."
+    count = facts.car_count
+    if count is not None:
+        return f"{member_name} has {count} car{'s' if count != 1 else ''}."
 
     return f"I couldn't find how many cars {member_name} has in their messages."
 
 
 # ---- Trip timing ----
 
-MONTH_PATTERN = r"\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?(?:,\s*\d{4})?"
-DATE_SLASH_PATTERN = r"\b\d{1,2}/\d{1,2}/\d{2,4}\b"
-
-
 def extract_destination_from_question(question: str) -> Optional[str]:
     """
     Try to capture the destination from phrases like 'trip to London'.
     This is intentionally simple.
     """
-    m = re.search(r"trip to ([A-Za-z ]+)\??", question, flags=re.IGNORECASE)
+    m = _TRIP_TO_RE.search(question)
     if m:
         return m.group(1).strip()
     return None
 
 
-def extract_date_phrase(text: str) -> Optional[str]:
-    """
-    Try to find a date-like phrase in the message: 'June 5th, 2025' or '06/05/2025'.
-    """
-    m = re.search(MONTH_PATTERN, text)
-    if m:
-        return m.group(0)
-
-    m = re.search(DATE_SLASH_PATTERN, text)
-    if m:
-        return m.group(0)
-
-    return None
-
-
-def answer_trip_when(question: str, member_name: str, messages: List[MemberMessage]) -> str:
+def answer_trip_when(
+    question: str,
+    member_name: str,
+    messages: List[MemberMessage],
+    texts_lower: pa.Array,
+    facts: MemberFacts,
+) -> str:
     """
     Answer 'When is X planning their trip to Y?' by:
     - Detecting a destination from the question
@@ -233,18 +201,15 @@ def answer_trip_when(question: str, member_name: str, messages: List[MemberMessa
     """
     destination = extract_destination_from_question(question)
     if not destination:
-        # Fall back: just look for 'trip' in their messages
-        candidate_msgs = [m for m in messages if "trip" in m.text.lower()]
-        if not candidate_msgs:
+        # Fall back: the member's latest 'trip' message, precomputed
+        if facts.latest_trip_text is None:
             return f"I couldn't find any trip details for {member_name}."
-        latest = candidate_msgs[-1]
-        date_phrase = extract_date_phrase(latest.text)
-        if date_phrase:
-            return f"{member_name} seems to be planning a trip around {date_phrase}."
-        return latest.text
+        if facts.latest_trip_date:
+            return f"{member_name} seems to be planning a trip around {facts.latest_trip_date}."
+        return facts.latest_trip_text
 
     dest_lower = destination.lower()
-    candidate_msgs = [m for m in messages if dest_lower in m.text.lower()]
+    candidate_msgs = filter_messages_containing(messages, texts_lower, dest_lower)
 
     if not candidate_msgs:
         return f"I couldn't find any messages from {member_name} about a trip to {destination}."
@@ -261,15 +226,11 @@ def answer_trip_when(question: str, member_name: str, messages: List[MemberMessa
 
 # ---- Favorite restaurants ----
 
-def answer_favorite_restaurants(member_name: str, messages: List[MemberMessage]) -> str:
+def answer_favorite_restaurants(member_name: str, facts: MemberFacts) -> str:
     """
-    Look for messages mentioning 'favorite restaurant(s)' for this member.
+    Report the member's messages mentioning 'favorite restaurant(s)'.
     """
-    candidates: List[str] = []
-    for msg in messages:
-        text_lower = msg.text.lower()
-        if "favorite" in text_lower and "restaurant" in text_lower:
-            candidates.append(msg.text)
+    candidates = facts.favorite_restaurants
 
     if not candidates:
         return f"I couldn't find any messages about {member_name}'s favorite restaurants."
@@ -284,7 +245,7 @@ def answer_favorite_restaurants(member_name: str, messages: List[MemberMessage])
 
 # ---------- Main QA function ----------
 
-def answer_question_baseline(question: str, messages: List[MemberMessage]) -> str:
+def answer_question_baseline(question: str, index: MemberIndex) -> str:
     """
     Main QA function used by the /ask endpoint.
 
@@ -295,11 +256,11 @@ def answer_question_baseline(question: str, messages: List[MemberMessage]) -> st
     4. Use a specialized handler if available.
     5. Fall back to returning the latest message from that member.
     """
-    if not messages:
+    if not index.messages:
         return "I couldn't retrieve any member messages."
 
     # --- 1) Strict resolution ---
-    member_name = find_member_name_in_question(question, messages)
+    member_name = find_member_name_in_question(question, index)
 
     # --- 2) If strict resolution fails, try a fuzzy suggestion ---
     requested_first_name = extract_requested_first_name(question)
@@ -308,7 +269,7 @@ def answer_question_baseline(question: str, messages: List[MemberMessage]) -> st
     if not member_name and requested_first_name:
         suggested_name = suggest_similar_member_by_first_name(
             requested_first_name,
-            messages,
+            index,
         )
         if suggested_name:
             member_name = suggested_name
@@ -317,19 +278,22 @@ def answer_question_baseline(question: str, messages: List[MemberMessage]) -> st
         # Nothing strict, nothing similar
         return "I couldn't identify which member the question is about."
 
-    member_msgs = filter_messages_for_member(messages, member_name)
+    member_msgs = filter_messages_for_member(index, member_name)
     if not member_msgs:
         return f"I couldn't find any messages for {member_name}."
 
     # --- 3) Classify question type and get core answer ---
     qtype = detect_question_type(question)
+    facts = index.member_facts[member_name]
 
     if qtype == "car_count":
-        core_answer = answer_car_count(member_name, member_msgs)
+        core_answer = answer_car_count(member_name, facts)
     elif qtype == "trip_when":
-        core_answer = answer_trip_when(question, member_name, member_msgs)
+        core_answer = answer_trip_when(
+            question, member_name, member_msgs, index.member_texts_lower[member_name], facts
+        )
     elif qtype == "favorite_restaurants":
-        core_answer = answer_favorite_restaurants(member_name, member_msgs)
+        core_answer = answer_favorite_restaurants(member_name, facts)
     else:
         # Generic fallback: latest message text
         latest_msg = member_msgs[-1]
@@ -1,6 +1,14 @@
+import os
 import uvicorn
-from app.api import app
+from app.api import app  # noqa: F401 - keeps `uvicorn main:app` working
 
 if __name__ == "__main__":
-    # Runs the FastAPI app on localhost:8000
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Runs the FastAPI app on localhost:8000, one worker process per CPU by
+    # default (override with WEB_CONCURRENCY).
+    # Workers need the app as an import string rather than the object.
+    uvicorn.run(
+        "app.api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )